@@ -1,6 +1,29 @@
-from med_crew.crew import MyCrew
+import threading
+from functools import lru_cache
+
 from med_crew.models import MeditationSession
 
+# A Crew keeps per-run state on its tasks, hence the lock around kickoff.
+_CREW_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_crew():
+    """
+    The crew graph (agents, tasks, tools, YAML config) is identical for every
+    request; only the kickoff inputs change, so build it once per process.
+    """
+    # Imported here so importing this module (e.g. from the API process, which
+    # only enqueues jobs) doesn't load CrewAI and the LLM client stack
+    from med_crew.crew import MyCrew
+
+    return MyCrew().crew()
+
+
+def reset_crew():
+    """Drop the cached crew so the next generation builds a fresh one"""
+    _get_crew.cache_clear()
+
 
 def generate_custom_meditation(
     meditation_type: str = "mindfulness",
@@ -8,7 +31,6 @@ def generate_custom_meditation(
     difficulty: str = "beginner",
     theme: str = "clarity and peace",
 ) -> MeditationSession:
-    from med_crew.tools.meditation_tools import ActionParameterGeneratorTool
     import time
     import sys
 
@@ -17,7 +39,6 @@ def generate_custom_meditation(
     print(f"Starting meditation generation with type={meditation_type}, duration={duration}, difficulty={difficulty}")
     
     try:
-        crew = MyCrew().crew()
         input_dict = {
             "meditation_type": meditation_type,
             "duration": duration,
@@ -27,7 +48,8 @@ def generate_custom_meditation(
         
         # Execute the crew tasks
         print("Starting CrewAI execution...")
-        result = crew.kickoff(input_dict)
+        with _CREW_LOCK:
+            result = _get_crew().kickoff(input_dict)
         print("CrewAI execution completed successfully!")
         
         crew_finish_time = time.time()
@@ -41,83 +63,19 @@ def generate_custom_meditation(
         traceback.print_exc(file=sys.stdout)
         raise
     
-    # Start tracking post-processing time
-    post_processing_start = time.time()
-    print("Starting parameter validation and post-processing...")
+    # Actions the crew left without parameters are filled while its output
+    # is parsed (Segment.fill_missing_parameters), so no second pass is needed
+    meditation_session = result.pydantic
+    if not isinstance(meditation_session, MeditationSession):
+        if meditation_session is None:
+            raise ValueError("Crew output could not be parsed into a MeditationSession")
+        # Already validated by the crew as a compatible model; adopt its
+        # fields without a second validation pass
+        meditation_session = MeditationSession.model_construct(**dict(meditation_session))
 
-    try:
-        # Create the parameter generator tool for validation once
-        param_generator = ActionParameterGeneratorTool()
-        
-        # Create parameter maps to avoid regenerating the same parameters
-        # This caches parameters by action_type and segment_type
-        parameter_cache = {}
-        
-        # Get the session from the crew result
-        print("Extracting meditation session from result...")
-        meditation_session = result.pydantic
-        
-        # Process all segments in one pass - with optimized approach
-        segment_count = len(meditation_session.segments)
-        print(f"Processing {segment_count} segments...")
-        
-        for i, segment in enumerate(meditation_session.segments):
-            segment_type = segment.type.value
-            print(f"Processing segment {i+1}/{segment_count}: {segment.title} (type: {segment_type})")
-            
-            action_count = len(segment.actions)
-            # Process all actions in this segment
-            for j, action in enumerate(segment.actions):
-                action_type = action.type.value
-                
-                # Create cache key for this combination
-                cache_key = f"{action_type}_{segment_type}"
-                
-                try:
-                    # Check if parameters exist and are valid
-                    if (
-                        not hasattr(action.parameters, "__dict__")
-                        or not action.parameters.__dict__
-                    ):
-                        # Check cache first before generating new parameters
-                        if cache_key in parameter_cache:
-                            action.parameters = parameter_cache[cache_key]
-                        else:
-                            # Generate parameters and cache them
-                            action.parameters = param_generator._run(
-                                action_type=action_type, segment_type=segment_type
-                            )
-                            parameter_cache[cache_key] = action.parameters
-                except Exception as e:
-                    print(f"  Error in action {j+1}/{action_count} ({action_type}): {str(e)}")
-                    # Generate parameters only if needed
-                    if cache_key in parameter_cache:
-                        action.parameters = parameter_cache[cache_key]
-                    else:
-                        action.parameters = param_generator._run(
-                            action_type=action_type, segment_type=segment_type
-                        )
-                        parameter_cache[cache_key] = action.parameters
-        
-        print("Parameter post-processing completed successfully.")
-        
-    except Exception as e:
-        print(f"Error during post-processing: {str(e)}")
-        print(f"Error type: {type(e)}")
-        import traceback
-        traceback.print_exc(file=sys.stdout)
-        raise
-        
-    finally:
-        # Record post-processing time
-        post_processing_end = time.time()
-        post_processing_time = post_processing_end - post_processing_start
-        print(f"Post-processing time: {post_processing_time:.2f} seconds")
-        print(f"Percentage of post-processing: {(post_processing_time/(post_processing_time + crew_execution_time))*100:.1f}%")
-        
-        # Report total time
-        total_time = time.time() - start_time
-        print(f"Total execution time: {total_time:.2f} seconds")
+    # Report total time
+    total_time = time.time() - start_time
+    print(f"Total execution time: {total_time:.2f} seconds")
 
     return meditation_session
 
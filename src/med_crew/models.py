@@ -1,6 +1,27 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidationInfo,
+    field_validator,
+    model_validator,
+)
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Dict, Any, Optional, Union
 from enum import Enum
+import orjson
+
+from med_crew.parameters import (
+    ActionParameters,
+    SpeakParameters,
+    PauseParameters,
+    BreathCueParameters,
+    BreathingCycleParameters,
+    SilenceParameters,
+    MusicParameters,
+    default_parameters,
+)
 
 """
 Base Enums
@@ -53,67 +74,29 @@ class SegmentType(str, Enum):
 
 
 """
-Action Parameters Models
+Task 1: Meditation Design Models
 """
 
 
-class ActionParameters(BaseModel):
-    """Base parameters for actions"""
-
-    pass
-
-
-class SpeakParameters(ActionParameters):
-    """Parameters for speak action"""
-
-    text: str = Field(..., description="The text to be spoken")
-
-
-class PauseParameters(ActionParameters):
-    """Parameters for pause action"""
+class PlannedSegment(BaseModel):
+    """A segment in the outline of the session"""
 
-    reason: Optional[str] = Field(None, description="Reason for the pause")
+    model_config = ConfigDict(frozen=True)
 
+    name: str = Field(..., description="Name of the segment")
+    duration_seconds: int = Field(..., ge=0, description="Approximate duration in seconds")
+    type: SegmentType = Field(..., description="Type of meditation segment")
 
-class BreathCueParameters(ActionParameters):
-    """Parameters for breath cues"""
 
-    phase: str = Field(..., description="Breath phase (inhale, exhale)")
-    sound: Optional[str] = Field(None, description="Sound cue to play")
-    text: Optional[str] = Field(None, description="Optional text cue")
+class BreathingPattern(BaseModel):
+    """Breathing pattern timings in seconds"""
 
+    model_config = ConfigDict(frozen=True)
 
-class BreathingCycleParameters(ActionParameters):
-    """Parameters for breathing cycle"""
-
-    inhale_seconds: int = Field(..., description="Inhale duration")
-    hold_seconds: int = Field(0, description="Hold duration")
-    exhale_seconds: int = Field(..., description="Exhale duration")
-    rest_seconds: int = Field(0, description="Rest duration")
-    repetitions: int = Field(..., description="Number of repetitions")
-    inhale_cue: Optional[str] = Field(None, description="Inhale cue text")
-    exhale_cue: Optional[str] = Field(None, description="Exhale cue text")
-
-
-class SilenceParameters(ActionParameters):
-    """Parameters for silence periods"""
-
-    type: str = Field(..., description="Type of silence (reflection, rest, transition)")
-
-
-class MusicParameters(ActionParameters):
-    """Parameters for music actions"""
-
-    track_id: Optional[str] = Field(None, description="ID of the music track")
-    volume: Optional[float] = Field(None, description="Volume level (0.0-1.0)")
-    fade_duration: Optional[int] = Field(
-        None, description="Duration of fade in/out in seconds"
-    )
-
-
-"""
-Task 1: Meditation Design Models
-"""
+    inhale: int = Field(..., description="Inhale duration")
+    hold: int = Field(0, description="Hold duration")
+    exhale: int = Field(..., description="Exhale duration")
+    rest: int = Field(0, description="Rest duration")
 
 
 class MeditationStructure(BaseModel):
@@ -130,18 +113,18 @@ class MeditationStructure(BaseModel):
     background_music_style: Optional[str] = Field(
         None, description="Suggested music style if any"
     )
-    planned_segments: List[Dict[str, Any]] = Field(
+    planned_segments: List[PlannedSegment] = Field(
         ..., description="Outline of planned segments with approximate timing"
     )
     key_elements: List[str] = Field(
         ..., description="Important elements to include in the meditation"
     )
-    breathing_pattern: Dict[str, Any] = Field(
+    breathing_pattern: BreathingPattern = Field(
         ..., description="Recommended breathing pattern"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "Clarity and Peace Meditation",
                 "theme": "Finding inner clarity and peaceful awareness",
@@ -191,6 +174,7 @@ class MeditationStructure(BaseModel):
                 "breathing_pattern": {"inhale": 4, "hold": 0, "exhale": 6, "rest": 3},
             }
         }
+    )
 
 
 """
@@ -249,7 +233,8 @@ class MeditationContent(BaseModel):
         ..., description="List of all meditation script segments"
     )
     
-    @validator("segments")
+    @field_validator("segments")
+    @classmethod
     def validate_segment_types(cls, segments):
         """
         Ensure all segment types are valid according to the current SegmentType enum
@@ -266,6 +251,8 @@ class MeditationContent(BaseModel):
 Task 3: Timing Orchestration Models
 """
 
+_end_time = attrgetter("end_time_seconds")
+
 
 class TimedInstruction(BaseModel):
     """A single timed instruction in the meditation"""
@@ -308,12 +295,13 @@ class MeditationTiming(BaseModel):
     )
     segments: List[TimedSegment] = Field(..., description="All timed segments")
 
-    @validator("total_duration_seconds")
-    def check_duration_matches_segments(cls, v, values):
+    @field_validator("total_duration_seconds")
+    @classmethod
+    def check_duration_matches_segments(cls, v, info: ValidationInfo):
         """Validate that total duration matches the end time of the last segment"""
-        if "segments" in values and values["segments"]:
-            segments = values["segments"]
-            max_end_time = max(segment.end_time_seconds for segment in segments)
+        segments = info.data.get("segments")
+        if segments:
+            max_end_time = max(map(_end_time, segments))
             if v != max_end_time:
                 raise ValueError(
                     f"Total duration ({v}s) does not match end of last segment ({max_end_time}s)"
@@ -360,6 +348,14 @@ class Segment(BaseModel):
     )
     actions: List[Action] = Field(..., description="List of actions in this segment.")
 
+    @model_validator(mode="after")
+    def fill_missing_parameters(self):
+        """Give actions the crew left with empty parameters the defaults for this segment"""
+        for action in self.actions:
+            if not getattr(action.parameters, "model_fields_set", None):
+                action.parameters = default_parameters(action.type, self.type.value)
+        return self
+
 
 class MeditationSession(BaseModel):
     """The complete meditation session, including all segments and metadata."""
@@ -377,20 +373,21 @@ class MeditationSession(BaseModel):
     )
     segments: List[Segment] = Field(..., description="List of segments in the session.")
 
-    @validator("duration_seconds")
-    def check_duration_matches_segments(cls, v, values):
+    @field_validator("duration_seconds")
+    @classmethod
+    def check_duration_matches_segments(cls, v, info: ValidationInfo):
         """Validate that duration matches the end time of the last segment"""
-        if "segments" in values and values["segments"]:
-            segments = values["segments"]
-            max_end_time = max(segment.end_time_seconds for segment in segments)
+        segments = info.data.get("segments")
+        if segments:
+            max_end_time = max(map(_end_time, segments))
             if v != max_end_time:
                 raise ValueError(
                     f"Duration ({v}s) does not match end of last segment ({max_end_time}s)"
                 )
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "Clarity and Peace Meditation",
                 "duration_seconds": 480,
@@ -428,3 +425,15 @@ class MeditationSession(BaseModel):
                 ],
             }
         }
+    )
+
+
+"""
+Precomputed JSON Schemas
+"""
+
+
+@lru_cache(maxsize=None)
+def json_schema_bytes(model: type) -> bytes:
+    """JSON Schema of a model, serialized once; models don't change at runtime"""
+    return orjson.dumps(model.model_json_schema())
@@ -0,0 +1,309 @@
+"""
+Action parameter models and the default parameters used when an action has none
+
+Kept free of CrewAI so validating a MeditationSession (models.Segment fills
+missing parameters from here) doesn't load the agent stack.
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple
+
+
+class ActionParameters(BaseModel):
+    """Base parameters for actions"""
+
+    # Immutable, so default instances can be shared across sessions and threads
+    model_config = ConfigDict(frozen=True)
+
+
+class SpeakParameters(ActionParameters):
+    """Parameters for speak action"""
+
+    text: str = Field(..., description="The text to be spoken")
+
+
+class PauseParameters(ActionParameters):
+    """Parameters for pause action"""
+
+    reason: Optional[str] = Field(None, description="Reason for the pause")
+
+
+class BreathCueParameters(ActionParameters):
+    """Parameters for breath cues"""
+
+    phase: str = Field(..., description="Breath phase (inhale, exhale)")
+    sound: Optional[str] = Field(None, description="Sound cue to play")
+    text: Optional[str] = Field(None, description="Optional text cue")
+
+
+class BreathingCycleParameters(ActionParameters):
+    """Parameters for breathing cycle"""
+
+    inhale_seconds: int = Field(..., description="Inhale duration")
+    hold_seconds: int = Field(0, description="Hold duration")
+    exhale_seconds: int = Field(..., description="Exhale duration")
+    rest_seconds: int = Field(0, description="Rest duration")
+    repetitions: int = Field(..., description="Number of repetitions")
+    inhale_cue: Optional[str] = Field(None, description="Inhale cue text")
+    exhale_cue: Optional[str] = Field(None, description="Exhale cue text")
+
+
+class SilenceParameters(ActionParameters):
+    """Parameters for silence periods"""
+
+    type: str = Field(..., description="Type of silence (reflection, rest, transition)")
+
+
+class MusicParameters(ActionParameters):
+    """Parameters for music actions"""
+
+    track_id: Optional[str] = Field(None, description="ID of the music track")
+    volume: Optional[float] = Field(None, description="Volume level (0.0-1.0)")
+    fade_duration: Optional[int] = Field(
+        None, description="Duration of fade in/out in seconds"
+    )
+
+
+# Shared parameter instances for actions whose parameters never vary; built
+# once at import and handed out by reference (parameter models are frozen)
+_PAUSE_DEFAULT = PauseParameters(reason="Allow for reflection")
+_SILENCE_DEFAULT = SilenceParameters(type="reflection")
+_TRANSITION_DEFAULT = SpeakParameters(text="Transitioning")
+_MUSIC_DEFAULT = MusicParameters(track_id="ambient_peace", volume=0.3)
+_PLACEHOLDER_SPEAK = SpeakParameters(text="Placeholder instruction")
+
+# Preloaded default parameters for common action types
+_DEFAULT_PARAMETERS = {
+    "pause": _PAUSE_DEFAULT,
+    "silence": _SILENCE_DEFAULT,
+    "transition_cue": _TRANSITION_DEFAULT,
+}
+
+
+# The builders below only see literals or strings from the default content
+# tables, so they skip validation with model_construct; caller-supplied
+# content_info is validated in ActionParameterGeneratorTool._run instead
+
+
+def _build_speak(voice_texts, breath_cues):
+    # Get a text or use default - simplified for speed
+    return SpeakParameters.model_construct(text=voice_texts[0] if voice_texts else "Take a moment to be present.")
+
+
+def _build_pause(voice_texts, breath_cues):
+    return _PAUSE_DEFAULT
+
+
+def _build_inhale_cue(voice_texts, breath_cues):
+    return BreathCueParameters.model_construct(phase="inhale", text=breath_cues.get("inhale", "Breathe in"))
+
+
+def _build_exhale_cue(voice_texts, breath_cues):
+    return BreathCueParameters.model_construct(phase="exhale", text=breath_cues.get("exhale", "Breathe out"))
+
+
+def _build_breathing_cycle(voice_texts, breath_cues):
+    # Simplified parameters for better performance
+    return BreathingCycleParameters.model_construct(
+        inhale_seconds=4,
+        hold_seconds=0,
+        exhale_seconds=6,
+        rest_seconds=2,
+        repetitions=3,
+        inhale_cue=breath_cues.get("inhale", "Breathe in"),
+        exhale_cue=breath_cues.get("exhale", "Breathe out"),
+    )
+
+
+def _build_silence(voice_texts, breath_cues):
+    return _SILENCE_DEFAULT
+
+
+def _build_transition_cue(voice_texts, breath_cues):
+    return _TRANSITION_DEFAULT
+
+
+def _build_music(voice_texts, breath_cues):
+    return _MUSIC_DEFAULT
+
+
+def _build_placeholder(voice_texts, breath_cues):
+    # Default to simple SpeakParameters if action type not recognized
+    return _PLACEHOLDER_SPEAK
+
+
+# Parameter builder per action type, keyed by ActionType value. ActionType
+# is a str enum, so its members hash to the same entries as the strings
+_PARAMETER_BUILDERS = {
+    "speak": _build_speak,
+    "pause": _build_pause,
+    "inhale_cue": _build_inhale_cue,
+    "exhale_cue": _build_exhale_cue,
+    "breathing_cycle": _build_breathing_cycle,
+    "silence": _build_silence,
+    "transition_cue": _build_transition_cue,
+    "play": _build_music,
+    "fade_in": _build_music,
+    "fade_out": _build_music,
+    "volume_change": _build_music,
+}
+
+
+# Default content for different segment types if content_info is not provided
+_DEFAULT_CONTENT = MappingProxyType({
+    "opening": MappingProxyType({
+        "voice_texts": (
+            "Welcome to this inner peace meditation.",
+            "Find a comfortable position and allow yourself to settle.",
+            "Take a deep breath in, and slowly exhale.",
+            "Let's begin our practice together.",
+        ),
+        "breath_cues": MappingProxyType({
+            "inhale": "Breathe in deeply",
+            "exhale": "Release and let go",
+        }),
+    }),
+    "breathwork": MappingProxyType({
+        "voice_texts": (
+            "Bring your attention to your breath.",
+            "Notice the natural rhythm of your breathing.",
+            "Allow your breath to deepen naturally.",
+            "With each breath, release any tension you may be holding.",
+        ),
+        "breath_cues": MappingProxyType({
+            "inhale": "Inhale deeply through your nose",
+            "exhale": "Exhale completely through your mouth",
+        }),
+    }),
+    "guidance": MappingProxyType({
+        "voice_texts": (
+            "Allow your awareness to rest gently in the present moment.",
+            "Notice any thoughts or feelings without judgment.",
+            "Observe your experience with a sense of curiosity and kindness.",
+            "Let go of any expectations and simply be here now.",
+        ),
+        "breath_cues": MappingProxyType({
+            "inhale": "Breathe in with awareness",
+            "exhale": "Release and let go completely",
+        }),
+    }),
+    "closing": MappingProxyType({
+        "voice_texts": (
+            "Begin to deepen your breath.",
+            "Gently wiggle your fingers and toes.",
+            "When you're ready, slowly open your eyes.",
+            "Carry this peace with you throughout your day.",
+        ),
+    }),
+})
+_NO_BREATH_CUES = MappingProxyType({})
+
+# (voice_texts, breath_cues) fallback per segment type, resolved once
+_SEGMENT_DEFAULTS = MappingProxyType({
+    segment_type: (
+        content.get("voice_texts", ()),
+        content.get("breath_cues", _NO_BREATH_CUES),
+    )
+    for segment_type, content in _DEFAULT_CONTENT.items()
+})
+_OPENING_DEFAULTS = _SEGMENT_DEFAULTS["opening"]
+
+
+def _build_parameters(
+    action_type: str,
+    segment_type: str,
+    content_info: Optional[Dict[str, Any]] = None,
+) -> ActionParameters:
+    """Build the parameter object for an action type within a segment type"""
+    # Check for pre-defined default parameters that don't depend on segment type
+    if action_type in _DEFAULT_PARAMETERS and not content_info:
+        return _DEFAULT_PARAMETERS[action_type]
+    # Use provided content or fall back to defaults
+    voice_texts, breath_cues = _SEGMENT_DEFAULTS.get(segment_type, _OPENING_DEFAULTS)
+    if content_info:
+        segment_content = content_info.get(segment_type, {})
+        voice_texts = segment_content.get("voice_texts", voice_texts)
+        breath_cues = segment_content.get("breath_cues", breath_cues)
+
+    builder = _PARAMETER_BUILDERS.get(action_type, _build_placeholder)
+    return builder(voice_texts, breath_cues)
+
+
+def _content_key(
+    segment_type: str, content_info: Dict[str, Any]
+) -> Optional[Tuple[Optional[tuple], Optional[tuple]]]:
+    """
+    Hashable form of the content_info fields the builders read for a segment,
+    or None when the segment has no content of its own and defaults apply.
+    """
+    segment_content = content_info.get(segment_type)
+    if not segment_content:
+        return None
+    voice_texts = segment_content.get("voice_texts")
+    breath_cues = segment_content.get("breath_cues")
+    if voice_texts is None and breath_cues is None:
+        return None
+    return (
+        None if voice_texts is None else tuple(voice_texts),
+        None if breath_cues is None else tuple(sorted(breath_cues.items())),
+    )
+
+
+def _validated(params: ActionParameters) -> ActionParameters:
+    """Run validation on parameters built from caller-supplied content"""
+    return type(params).model_validate(params.model_dump(exclude_unset=True))
+
+
+@lru_cache(maxsize=256)
+def _cached_parameters(
+    action_type: str,
+    segment_type: str,
+    content_key: Optional[Tuple[Optional[tuple], Optional[tuple]]] = None,
+) -> ActionParameters:
+    """
+    Parameters per (action_type, segment_type, content_key), memoized process-wide.
+    Without content_key they only depend on the code version, so the first
+    request warms the table.
+    """
+    if content_key is None:
+        return _build_parameters(action_type, segment_type)
+    voice_texts, breath_cues = content_key
+    segment_content = {}
+    if voice_texts is not None:
+        segment_content["voice_texts"] = voice_texts
+    if breath_cues is not None:
+        segment_content["breath_cues"] = dict(breath_cues)
+    return _validated(
+        _build_parameters(action_type, segment_type, {segment_type: segment_content})
+    )
+
+
+def default_parameters(action_type: str, segment_type: str) -> ActionParameters:
+    """Default parameters for an action; the memoized instance is frozen, so it is shared"""
+    return _cached_parameters(action_type, segment_type)
+
+
+# Actions whose builders read content_info; every other action ignores it
+_CONTENT_ACTIONS = frozenset({"speak", "inhale_cue", "exhale_cue", "breathing_cycle"})
+
+
+def action_parameters(
+    action_type: str,
+    segment_type: str,
+    content_info: Optional[Dict[str, Any]] = None,
+) -> ActionParameters:
+    """
+    Parameters for an action within a segment type, taking the segment's texts
+    from content_info when given. Unknown action types get a placeholder.
+    """
+    if content_info and action_type in _CONTENT_ACTIONS:
+        try:
+            return _cached_parameters(
+                action_type, segment_type, _content_key(segment_type, content_info)
+            )
+        except (AttributeError, TypeError):
+            # Content that can't be keyed is built and validated uncached
+            return _validated(_build_parameters(action_type, segment_type, content_info))
+    return _cached_parameters(action_type, segment_type)
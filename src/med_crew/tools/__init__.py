@@ -8,6 +8,10 @@ from med_crew.tools.meditation_tools import (
     MeditationContentTool,
     JSONValidationTool,
     ActionParameterGeneratorTool,
+    compute_timing_plan,
+    breathing_pattern,
+    meditation_content,
+    validate_meditation_json,
 )
 
 __all__ = [
@@ -16,4 +20,8 @@ __all__ = [
     "MeditationContentTool",
     "JSONValidationTool",
     "ActionParameterGeneratorTool",
+    "compute_timing_plan",
+    "breathing_pattern",
+    "meditation_content",
+    "validate_meditation_json",
 ]
@@ -0,0 +1,110 @@
+"""
+Queue worker that runs meditation generation jobs outside the API process.
+
+Usage: python -m med_crew.worker --workers 2
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+
+import orjson
+import redis
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger("app")
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "2"))
+QUEUE_POLL_TIMEOUT = 5  # seconds BRPOP blocks before checking again
+REDIS_RETRY_MIN = 1  # seconds to wait after the first Redis error
+REDIS_RETRY_MAX = 30  # cap for the doubling backoff while Redis stays down
+
+
+def run_job(payload: bytes):
+    """Decode one queued payload and run it; malformed payloads fail the job instead of the worker"""
+    from med_crew.api import MeditationRequest, run_generation_job, set_job_state
+
+    job_id = None
+    try:
+        job = orjson.loads(payload)
+        job_id = job["job_id"]
+        req = MeditationRequest(**job["req"])
+    except (ValueError, KeyError, TypeError) as e:
+        # orjson.JSONDecodeError and pydantic's ValidationError are ValueErrors
+        logger.error(f"Dropping malformed job payload {payload[:200]!r}: {e}")
+        if isinstance(job_id, str):
+            set_job_state(job_id, "failed", error=f"Invalid job payload: {e}")
+        return
+    run_generation_job(job_id, req, job.get("user_id"))
+
+
+def work(poll_timeout: int = QUEUE_POLL_TIMEOUT):
+    """Consume generation jobs from the Redis queue until interrupted"""
+    # Worker processes are spawned, not forked, so this import builds fresh
+    # Redis/Mongo clients in each of them
+    from med_crew.api import JOB_QUEUE, ensure_indexes, r
+
+    # Created here rather than at API startup: workers do the inserts, and
+    # the API only needs Mongo for /result, so it can start while Mongo is down
+    try:
+        ensure_indexes()
+    except PyMongoError as e:
+        logger.warning(f"Could not create session indexes: {e}")
+
+    delay = REDIS_RETRY_MIN
+    while True:
+        try:
+            item = r.brpop(JOB_QUEUE, timeout=poll_timeout)
+            if item is not None:
+                run_job(item[1])
+        except redis.RedisError as e:
+            # e.g. Redis restarting; keep the worker alive and reconnect
+            logger.warning(f"Redis unavailable, retrying in {delay}s: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, REDIS_RETRY_MAX)
+            continue
+        delay = REDIS_RETRY_MIN
+
+
+def _work_forever():
+    try:
+        work()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run meditation generation workers")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKER_CONCURRENCY,
+        help="Number of worker processes",
+    )
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        _work_forever()
+        return
+
+    # The parent already created clients (and PyMongo monitor threads) by
+    # importing med_crew.api through the package; forking would copy them
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_work_forever, name=f"med-crew-worker-{i + 1}")
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import pytest
+
+from med_crew.models import ActionType, SegmentType
+from med_crew.parameters import _build_parameters
+
+
+@pytest.mark.parametrize("segment_type", [s.value for s in SegmentType] + ["unknown"])
+@pytest.mark.parametrize("action_type", [a.value for a in ActionType] + ["unknown"])
+def test_built_parameters_match_validated_construction(action_type, segment_type):
+    # Builders skip validation with model_construct; the result must be what
+    # validation would have produced
+    params = _build_parameters(action_type, segment_type)
+
+    assert type(params).model_validate(params.model_dump()) == params
+    # Segment.fill_missing_parameters treats an empty fields set as "no parameters"
+    assert params.model_fields_set
@@ -0,0 +1,42 @@
+import pytest
+
+from med_crew.models import MusicParameters, PauseParameters, Segment
+from med_crew.parameters import default_parameters
+
+
+def _segment(action_type, parameters):
+    return Segment.model_validate({
+        "title": "Breath",
+        "type": "breathwork",
+        "start_time_seconds": 0,
+        "end_time_seconds": 60,
+        "actions": [{
+            "agent": "VoiceAgent",
+            "type": action_type,
+            "start_time_seconds": 0,
+            "duration_seconds": 10,
+            "parameters": parameters,
+        }],
+    })
+
+
+@pytest.mark.parametrize("parameters", [{}, {"unexpected": "value"}])
+@pytest.mark.parametrize("action_type", ["speak", "inhale_cue", "pause", "play"])
+def test_empty_parameters_get_segment_defaults(action_type, parameters):
+    segment = _segment(action_type, parameters)
+
+    assert segment.actions[0].parameters == default_parameters(action_type, "breathwork")
+
+
+@pytest.mark.parametrize(
+    "action_type, parameters, expected",
+    [
+        ("pause", {"reason": None}, PauseParameters(reason=None)),
+        ("play", {"track_id": "x"}, MusicParameters(track_id="x")),
+    ],
+)
+def test_explicit_parameters_are_kept(action_type, parameters, expected):
+    segment = _segment(action_type, parameters)
+
+    assert segment.actions[0].parameters == expected
+    assert segment.actions[0].parameters.model_fields_set == set(parameters)